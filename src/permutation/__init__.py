@@ -13,13 +13,12 @@ for more information.
 """
 
 from __future__ import annotations
+from bisect import bisect_right
 from collections.abc import Iterable, Iterator, Sequence
-from functools import reduce
-from itertools import starmap
-from math import gcd
-import operator
+from math import factorial, gcd
 import re
-from typing import Any, List, Optional, TypeVar, cast
+import sys
+from typing import Any, Optional, TypeVar
 
 __version__ = "0.5.0"
 __author__ = "John Thorvald Wodder II"
@@ -31,6 +30,19 @@ __all__ = ["Permutation"]
 
 T = TypeVar("T")
 
+#: An element of a cycle in cycle notation.  This accepts the same spellings
+#: of nonnegative integers as `int()` does, including a leading ``+`` and
+#: underscores between digits.
+_INT_RGX = re.compile(r"\+?\d+(?:_\d+)*")
+
+#: A parenthesized cycle in cycle notation, preceded by any separators that
+#: may appear between cycles
+_CYCLE_RGX = re.compile(
+    r"[\s,]*\(\s*(?:(?P<elems>{0}(?:(?:\s*,\s*|\s+){0})*)\s*)?\)".format(
+        _INT_RGX.pattern
+    )
+)
+
 
 class Permutation:
     """
@@ -43,6 +55,8 @@ class Permutation:
     equality but not for ordering/sorting.
     """
 
+    __slots__ = ("__map", "__cycles", "__order", "__hash", "__even", "__weakref__")
+
     def __init__(self, *img: int) -> None:
         """
         Construct a permutation from a word representation.  The arguments are
@@ -69,6 +83,28 @@ class Permutation:
         while d > 0 and img[d - 1] == d:
             d -= 1
         self.__map: tuple[int, ...] = img[:d]
+        # Lazily-computed caches of derived values:
+        self.__cycles: Optional[tuple[tuple[int, ...], ...]] = None
+        self.__order: Optional[int] = None
+        self.__hash: Optional[int] = None
+        self.__even: Optional[bool] = None
+
+    @classmethod
+    def _from_trusted(cls, img: Sequence[int]) -> Permutation:
+        """
+        Construct a permutation from a word representation that is already
+        known to be valid, skipping the checks performed by the constructor
+        """
+        d = len(img)
+        while d > 0 and img[d - 1] == d:
+            d -= 1
+        p = cls.__new__(cls)
+        p.__map = tuple(img[:d] if d < len(img) else img)
+        p.__cycles = None
+        p.__order = None
+        p.__hash = None
+        p.__even = None
+        return p
 
     def __call__(self, i: int) -> int:
         """
@@ -79,7 +115,8 @@ class Permutation:
         :return: the image of ``i`` under the permutation
         :meta autosection: operations
         """
-        return self.__map[i - 1] if 0 < i <= len(self.__map) else i
+        m = self.__map
+        return m[i - 1] if 0 < i <= len(m) else i
 
     def __mul__(self, other: Permutation) -> Permutation:
         """
@@ -91,9 +128,16 @@ class Permutation:
         :rtype: Permutation
         :meta autosection: operations
         """
-        return type(self)(
-            *(self(other(i + 1)) for i in range(max(self.degree, other.degree)))
-        )
+        if not other.__map:
+            return self
+        elif not self.__map:
+            return type(self)._from_trusted(other.__map)
+        n = max(self.degree, other.degree)
+        a = self.to_image(n)
+        r = type(self)._from_trusted([a[j - 1] for j in other.to_image(n)])
+        if self.__even is not None and other.__even is not None:
+            r.__even = self.__even == other.__even
+        return r
 
     def __pow__(self, n: int) -> Permutation:
         """
@@ -114,17 +158,13 @@ class Permutation:
             p = self.inverse()
         else:
             p = self
-        while not (n & 1):
-            p *= p
-            n >>= 1
+        # Left-to-right binary exponentiation: one squaring per bit after the
+        # leading one, plus one multiplication per further set bit.
         agg = p
-        p *= p
-        n >>= 1
-        while n > 0:
-            if n & 1:
+        for i in range(n.bit_length() - 2, -1, -1):
+            agg *= agg
+            if (n >> i) & 1:
                 agg *= p
-            p *= p
-            n >>= 1
         return agg
 
     def __repr__(self) -> str:
@@ -170,13 +210,17 @@ class Permutation:
         s = s.strip()
         if s == "1":
             return cls()
-        if not (s.startswith("(") and s.endswith(")")):
+        if not s.startswith("("):
             raise ValueError(s)
         cycles = []
-        for cyc in re.split(r"\)[\s,]*\(", s[1:-1]):
-            cyc = cyc.strip()
-            if cyc:
-                cycles.append(map(int, re.split(r"\s*,\s*|\s+", cyc)))
+        pos = 0
+        while pos < len(s):
+            m = _CYCLE_RGX.match(s, pos)
+            if m is None:
+                raise ValueError(s)
+            if m["elems"] is not None:
+                cycles.append(map(int, _INT_RGX.findall(m["elems"])))
+            pos = m.end()
         return cls.from_cycles(*cycles)
 
     def __bool__(self) -> bool:
@@ -185,16 +229,52 @@ class Permutation:
 
         :meta autosection: properties
         """
-        return self.__map != ()
+        return bool(self.__map)
 
     def __eq__(self, other: Any) -> bool:
-        if type(self) is type(other):
+        if self is other:
+            return True
+        elif type(self) is type(other):
+            if (
+                self.__hash is not None
+                and other.__hash is not None
+                and self.__hash != other.__hash
+            ):
+                return False
             return bool(self.__map == other.__map)
         else:
             return NotImplemented
 
     def __hash__(self) -> int:
-        return hash(self.__map)
+        if self.__hash is None:
+            self.__hash = hash(self.__map)
+        return self.__hash
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickle just the image, and rebuild through the trusted constructor
+        # so that unpickling neither revalidates the image nor depends on the
+        # signature of a subclass's `__init__`.  The cached properties are
+        # recomputed on demand after unpickling.  The instance attributes of a
+        # subclass without `__slots__` are pickled as the state.
+        state = getattr(self, "__dict__", None)
+        if state:
+            return (type(self)._from_trusted, (self.__map,), state)
+        return (type(self)._from_trusted, (self.__map,))
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # Pickles written by v0.5.0 and earlier, from before `Permutation` had
+        # `__slots__`, restore the instance `__dict__`, in which the image was
+        # stored under its mangled name.
+        state = dict(state)
+        img = state.pop("_Permutation__map", None)
+        if img is not None:
+            self.__map = tuple(img)
+            self.__cycles = None
+            self.__order = None
+            self.__hash = None
+            self.__even = None
+        if state:
+            self.__dict__.update(state)
 
     def inverse(self) -> Permutation:
         """
@@ -205,7 +285,17 @@ class Permutation:
         :rtype: Permutation
         :meta autosection: properties
         """
-        return type(self)(*self.permute(range(1, self.degree + 1)))
+        if not self.__map:
+            # The identity is its own inverse, and permutations are immutable.
+            return self
+        img = [0] * len(self.__map)
+        for i, v in enumerate(self.__map, start=1):
+            img[v - 1] = i
+        q = type(self)._from_trusted(img)
+        # A permutation and its inverse have the same cycle type:
+        q.__order = self.__order
+        q.__even = self.__even
+        return q
 
     @property
     def degree(self) -> int:
@@ -229,7 +319,15 @@ class Permutation:
 
         :meta autosection: properties
         """
-        return reduce(lcm, map(len, self.to_cycles()), 1)
+        if self.__order is None:
+            if self.__cycles is None:
+                lengths = _cycle_lengths(self.__map)
+            else:
+                lengths = list(map(len, self.__cycles))
+            self.__order = lcm(*lengths)
+            if self.__even is None:
+                self.__even = _lengths_are_even(lengths)
+        return self.__order
 
     @property
     def is_even(self) -> bool:
@@ -240,7 +338,9 @@ class Permutation:
 
         :meta autosection: properties
         """
-        return not sum((len(cyc) - 1 for cyc in self.to_cycles()), 0) % 2
+        if self.__even is None:
+            self.__even = _is_even(self.__map)
+        return self.__even
 
     @property
     def is_odd(self) -> bool:
@@ -271,9 +371,12 @@ class Permutation:
         :rtype: bool
         :meta autosection: properties
         """
-        return all(
-            i + 1 in (a, b) for (i, (a, b)) in enumerate(zip(self.__map, other.__map))
-        )
+        # Integers beyond the smaller of the two degrees are fixed by at least
+        # one of the permutations, so only the common prefix needs checking.
+        for i, (a, b) in enumerate(zip(self.__map, other.__map), start=1):
+            if a != i and b != i:
+                return False
+        return True
 
     def to_image(self, n: Optional[int] = None) -> tuple[int, ...]:
         """
@@ -291,9 +394,13 @@ class Permutation:
         :raise ValueError: if ``n`` is less than `degree`
         :meta autosection: properties
         """
-        if n is not None and n < self.degree:
+        d = self.degree
+        if n is None or n == d:
+            return self.__map
+        elif n < d:
             raise ValueError(n)
-        return self.__map + tuple(range(self.degree + 1, (n or self.degree) + 1))
+        else:
+            return self.__map + tuple(range(d + 1, n + 1))
 
     def to_cycles(self) -> list[tuple[int, ...]]:
         """
@@ -316,19 +423,24 @@ class Permutation:
         :return: the cycle decomposition of the permutation
         :meta autosection: properties
         """
-        cmap = list(self.__map)
-        cycles = []
-        for i in range(len(cmap)):
-            if cmap[i] not in (0, i + 1):
-                x = i + 1
-                cyke = []
-                while True:
-                    cyke.append(x)
-                    cmap[x - 1], x = 0, cmap[x - 1]
-                    if x == i + 1:
-                        break
-                cycles.append(tuple(cyke))
-        return cycles
+        if self.__cycles is None:
+            img = self.__map
+            seen = bytearray(len(img))
+            cycles = []
+            for i, x in enumerate(img, start=1):
+                if not seen[i - 1] and x != i:
+                    seen[i - 1] = 1
+                    cyke = [i]
+                    while x != i:
+                        seen[x - 1] = 1
+                        cyke.append(x)
+                        x = img[x - 1]
+                    cycles.append(tuple(cyke))
+            self.__cycles = tuple(cycles)
+            if self.__even is None:
+                self.__even = _lengths_are_even([len(c) for c in cycles])
+        # Return a fresh list so that callers cannot modify the cache:
+        return list(self.__cycles)
 
     @classmethod
     def cycle(cls, *cyc: int) -> Permutation:
@@ -351,17 +463,20 @@ class Permutation:
             - if ``cyc`` contains the same value more than once
         """
         cyclist = list(cyc)
-        mapping = {}
+        seen = set()
         maxVal = 0
-        for i, v in enumerate(cyclist):
+        for v in cyclist:
             if v < 1:
                 raise ValueError("values must be positive")
-            if v in mapping:
+            if v in seen:
                 raise ValueError(f"{v} appears more than once in cycle")
-            mapping[v] = cyclist[i + 1] if i < len(cyclist) - 1 else cyclist[0]
+            seen.add(v)
             if v > maxVal:
                 maxVal = v
-        return cls(*(mapping.get(i, i) for i in range(1, maxVal + 1)))
+        img = list(range(1, maxVal + 1))
+        for v, y in zip(cyclist, cyclist[1:] + cyclist[:1]):
+            img[v - 1] = y
+        return cls._from_trusted(img)
 
     @classmethod
     def from_cycles(cls, *cycles: Iterable[int]) -> Permutation:
@@ -381,7 +496,29 @@ class Permutation:
             - if any cycle contains a value less than 1
             - if any cycle contains the same value more than once
         """
-        return reduce(operator.mul, starmap(cls.cycle, cycles), cls())
+        cyclists = []
+        maxVal = 0
+        for cyc in cycles:
+            cyclist = list(cyc)
+            seen = set()
+            for v in cyclist:
+                if v < 1:
+                    raise ValueError("values must be positive")
+                if v in seen:
+                    raise ValueError(f"{v} appears more than once in cycle")
+                seen.add(v)
+                if v > maxVal:
+                    maxVal = v
+            cyclists.append(cyclist)
+        # Multiply the cycles together from left to right, updating the image
+        # of only the elements of each cycle in turn:
+        img = list(range(1, maxVal + 1))
+        for cyclist in cyclists:
+            if cyclist:
+                old = [img[v - 1] for v in cyclist]
+                for v, y in zip(cyclist, old[1:] + old[:1]):
+                    img[v - 1] = y
+        return cls._from_trusted(img)
 
     def right_inversion_count(self, n: Optional[int] = None) -> list[int]:
         """
@@ -411,12 +548,11 @@ class Permutation:
             raise ValueError(n)
         else:
             m = n
-        left = list(range(1, m + 1))
-        digits = []
-        for x in left[:]:
-            i = left.index(self(x))
-            del left[i]
-            digits.append(i)
+        # Fixed points past the degree have no right inversions, so only the
+        # image proper needs to be run through the tree.
+        d = self.degree
+        digits = _lehmer_digits(self.__map, d)
+        digits.extend([0] * (m - d))
         return digits
 
     def inversions(self) -> int:
@@ -456,7 +592,7 @@ class Permutation:
         :raises ValueError: if ``n`` is less than `degree`
         :meta autosection: properties
         """
-        return from_factorial_base(self.right_inversion_count(n)[:-1])
+        return _fold_lehmer_digits(self.right_inversion_count(n))
 
     @classmethod
     def from_lehmer(cls, x: int, n: int) -> Permutation:
@@ -478,17 +614,15 @@ class Permutation:
         """
         if x < 0:
             raise ValueError(x)
-        mapping: list[int] = []
+        digits: list[int] = []
         x2 = x
         for i in range(1, n + 1):
             x2, c = divmod(x2, i)
-            for j, y in enumerate(mapping):
-                if y >= c:
-                    mapping[j] += 1
-            mapping.insert(0, c)
+            digits.append(c)
         if x2 != 0:
             raise ValueError(x)
-        return cls(*(c + 1 for c in mapping))
+        digits.reverse()
+        return cls._from_trusted(_from_lehmer_digits(digits, n))
 
     def left_lehmer(self) -> int:
         """
@@ -507,13 +641,13 @@ class Permutation:
         :rtype: int
         :meta autosection: properties
         """
-        left = list(range(self.degree, 0, -1))
-        digits = []
-        for x in left[:]:
-            i = left.index(self(x))
-            del left[i]
-            digits.append(i)
-        return from_factorial_base(digits[:-1])
+        # Each digit is the number of not-yet-seen values greater than
+        # `self(x)`, i.e., the number of not-yet-seen values less than
+        # `self(x)` when the values are numbered in reverse.
+        d = self.degree
+        return _fold_lehmer_digits(
+            _lehmer_digits((d + 1 - v for v in reversed(self.__map)), d)
+        )
 
     @classmethod
     def from_left_lehmer(cls, x: int) -> Permutation:
@@ -528,13 +662,16 @@ class Permutation:
         """
         if x < 0:
             raise ValueError(x)
-        mapping = [0]
-        for c in reversed(to_factorial_base(x)):
-            for i, y in enumerate(mapping):
-                if y >= c:
-                    mapping[i] += 1
-            mapping.append(c)
-        return cls(*(len(mapping) - c for c in mapping))
+        # The digits give, for each `x` from the degree down to 1, the number
+        # of not-yet-used values greater than `p(x)`.
+        digits = to_factorial_base(x)
+        digits.append(0)
+        d = len(digits)
+        img = _from_lehmer_digits(
+            [i - 1 - c for i, c in zip(range(d, 0, -1), digits)], d
+        )
+        img.reverse()
+        return cls._from_trusted(img)
 
     @classmethod
     def group(cls, n: int) -> Iterator[Permutation]:
@@ -555,10 +692,10 @@ class Permutation:
         # Use a nested function as the actual generator so that the ValueError
         # above can be raised immediately:
         def sn() -> Iterator[Permutation]:
-            p = cls()
-            while p.degree <= n:
-                yield p
-                p = p.next_permutation()
+            img = list(range(1, n + 1))
+            yield cls._from_trusted(img)
+            while _next_word(img):
+                yield cls._from_trusted(img)
 
         return sn()
 
@@ -569,15 +706,9 @@ class Permutation:
 
         :meta autosection: construction
         """
-        map2 = list(self.__map)
-        for i in range(1, len(map2)):
-            if map2[i] > map2[i - 1]:
-                j = 0
-                while map2[i] <= map2[j]:
-                    j += 1
-                map2[i], map2[j] = map2[j], map2[i]
-                map2[:i] = reversed(map2[:i])
-                return type(self)(*map2)
+        img = list(self.__map)
+        if _next_word(img):
+            return type(self)._from_trusted(img)
         d = max(self.degree, 1)
         return type(self).cycle(d, d + 1)
 
@@ -592,15 +723,9 @@ class Permutation:
         """
         if self.degree < 2:
             raise ValueError("cannot decrement identity")
-        map2 = list(self.__map)
-        for i in range(1, len(map2)):
-            if map2[i] < map2[i - 1]:
-                j = 0
-                while map2[i] >= map2[j]:
-                    j += 1
-                map2[i], map2[j] = map2[j], map2[i]
-                map2[:i] = reversed(map2[:i])
-                return type(self)(*map2)
+        img = list(self.__map)
+        if _prev_word(img):
+            return type(self)._from_trusted(img)
         raise AssertionError("Unreachable state reached")  # pragma: no cover
 
     def permute(self, xs: Iterable[T]) -> list[T]:
@@ -626,16 +751,183 @@ class Permutation:
         xs = list(xs)
         if len(xs) < self.degree:
             raise ValueError("sequence must have at least `degree` elements")
-        out: list[Optional[T]] = [None] * len(xs)
-        for i in range(len(xs)):
-            out[self(i + 1) - 1] = xs[i]
-        return cast(List[T], out)
+        # Elements past the degree stay where they are, so start from a copy
+        # and only scatter the elements that move.
+        out = xs[:]
+        for x, i in zip(xs, self.__map):
+            out[i - 1] = x
+        return out
+
+
+if sys.version_info >= (3, 9):
+    from math import lcm
+else:
+
+    def lcm(*integers: int) -> int:
+        """Calculate the least common multiple of the given integers"""
+        r = 1
+        for x in integers:
+            d = gcd(r, x)
+            r = 0 if d == 0 else abs(r * x) // d
+        return r
+
+
+def _cycle_lengths(img: Sequence[int]) -> list[int]:
+    """
+    Return the lengths of the nontrivial cycles of the word representation
+    ``img`` without constructing the cycles themselves
+    """
+    seen = bytearray(len(img))
+    lengths = []
+    for i, x in enumerate(img, start=1):
+        if not seen[i - 1] and x != i:
+            seen[i - 1] = 1
+            k = 1
+            while x != i:
+                seen[x - 1] = 1
+                k += 1
+                x = img[x - 1]
+            lengths.append(k)
+    return lengths
+
+
+def _lengths_are_even(lengths: Sequence[int]) -> bool:
+    """
+    Return whether a permutation whose nontrivial cycles have the given
+    lengths is even
+    """
+    # A cycle of length `k` is a product of `k-1` transpositions.
+    return not (sum(lengths) - len(lengths)) % 2
+
+
+def _is_even(img: Sequence[int]) -> bool:
+    """Return whether the word representation ``img`` is an even permutation"""
+    if len(img) <= 16:
+        # For small degrees, it's faster to sort a copy of the image by
+        # swapping each element into place and count the swaps.
+        work = list(img)
+        swaps = 0
+        for i in range(len(work)):
+            while work[i] != i + 1:
+                j = work[i] - 1
+                work[i], work[j] = work[j], work[i]
+                swaps += 1
+        return not swaps % 2
+    return _lengths_are_even(_cycle_lengths(img))
+
+
+def _next_word(img: list[int]) -> bool:
+    """
+    Rearrange ``img`` in place into the next word of the same length in left
+    Lehmer code order.  Returns `False` (leaving ``img`` unchanged) if there is
+    no such word.
+    """
+    # This is the textbook lexicographic "previous permutation" step applied
+    # to the reversal of `img`: find the first ascent `i`, swap `img[i]` with
+    # the largest smaller element before it (found by scanning the strictly
+    # decreasing prefix from its start), and reverse the prefix.
+    for i in range(1, len(img)):
+        if img[i] > img[i - 1]:
+            j = 0
+            while img[i] <= img[j]:
+                j += 1
+            img[i], img[j] = img[j], img[i]
+            img[:i] = img[i - 1 :: -1]
+            return True
+    return False
+
+
+def _prev_word(img: list[int]) -> bool:
+    """
+    Rearrange ``img`` in place into the previous word of the same length in
+    left Lehmer code order.  Returns `False` (leaving ``img`` unchanged) if
+    there is no such word.
+    """
+    for i in range(1, len(img)):
+        if img[i] < img[i - 1]:
+            j = 0
+            while img[i] >= img[j]:
+                j += 1
+            img[i], img[j] = img[j], img[i]
+            img[:i] = img[i - 1 :: -1]
+            return True
+    return False
+
+
+def _fenwick_ones(n: int) -> list[int]:
+    """
+    Construct a `Fenwick tree <https://en.wikipedia.org/wiki/Fenwick_tree>`_
+    over the integers 1 through ``n`` in which every integer has a count of 1
+    """
+    return [i & -i for i in range(n + 1)]
+
+
+def _lehmer_digits(values: Iterable[int], n: int) -> list[int]:
+    """
+    Given an iterable of distinct integers from 1 through ``n``, return a list
+    in which the element at index ``i`` is the number of integers less than
+    the ``i``-th element of ``values`` that do not occur among the elements
+    before it
+    """
+    # The tree walks are written out inline rather than calling helper
+    # functions, as this loop runs once per element of `values`.
+    tree = _fenwick_ones(n)
+    digits = []
+    for v in values:
+        rank = 0
+        i = v - 1
+        while i > 0:
+            rank += tree[i]
+            i &= i - 1
+        digits.append(rank)
+        i = v
+        while i <= n:
+            tree[i] -= 1
+            i += i & -i
+    return digits
+
+
+def _from_lehmer_digits(digits: Iterable[int], n: int) -> list[int]:
+    """Inverse of `_lehmer_digits`"""
+    tree = _fenwick_ones(n)
+    top = 1 << n.bit_length()
+    values = []
+    for c in digits:
+        # Descend the tree to find the smallest integer with `c + 1` unused
+        # integers at or below it.
+        v = 0
+        k = c + 1
+        step = top
+        while step:
+            if v + step <= n and tree[v + step] < k:
+                v += step
+                k -= tree[v]
+            step >>= 1
+        v += 1
+        values.append(v)
+        i = v
+        while i <= n:
+            tree[i] -= 1
+            i += i & -i
+    return values
+
+
+def _fold_lehmer_digits(digits: Sequence[int]) -> int:
+    """
+    Convert a list of digits as returned by `_lehmer_digits()` (i.e., in
+    factorial base in descending order of place value, including the final
+    zero digit for the :math:`0!` place) to an integer.  The digits are
+    assumed to be in range and are not validated.
+    """
+    # Horner's rule: the digit at index `i` has place value `(len - i - 1)!`.
+    code = 0
+    for i, c in zip(range(len(digits), 0, -1), digits):
+        code = code * i + c
+    return code
 
 
-def lcm(x: int, y: int) -> int:
-    """Calculate the least common multiple of ``x`` and ``y``"""
-    d = gcd(x, y)
-    return 0 if d == 0 else abs(x * y) // d
+#: The factorials that fit in 64 bits; ``_SMALL_FACTORIALS[i] == i!``
+_SMALL_FACTORIALS = tuple(factorial(i) for i in range(21))
 
 
 def to_factorial_base(n: int) -> list[int]:
@@ -649,13 +941,18 @@ def to_factorial_base(n: int) -> list[int]:
         raise ValueError(n)
     if n == 0:
         return [0]
+    facts: Sequence[int] = _SMALL_FACTORIALS
+    if facts[-1] <= n:
+        # Extend a copy local to this call so that large inputs don't leave
+        # big factorials allocated afterwards.
+        facts = list(facts)
+        while facts[-1] <= n:
+            facts.append(facts[-1] * len(facts))
+    # The number of digits is the largest `k` for which `k! <= n`:
     digits = []
-    i = 1
-    while n > 0:
-        digits.append(n % (i + 1))
-        i += 1
-        n //= i
-    digits.reverse()
+    for i in range(bisect_right(facts, n) - 1, 0, -1):
+        d, n = divmod(n, facts[i])
+        digits.append(d)
     return digits
 
 
@@ -1,4 +1,6 @@
 from __future__ import annotations
+import copy
+import pickle
 import pytest
 from permutation import Permutation
 
@@ -69,6 +71,8 @@ def test_from_cycles(cycles: tuple[tuple[int, ...], ...], p: Permutation) -> Non
         ("(3,4,5) (1,2)", Permutation(2, 1, 4, 5, 3)),
         ("(3 4 5),(1 2)", Permutation(2, 1, 4, 5, 3)),
         ("(3,4,5),(1,2)", Permutation(2, 1, 4, 5, 3)),
+        ("(+1 +2)", Permutation(2, 1)),
+        ("(1_0 1)", Permutation(10, 2, 3, 4, 5, 6, 7, 8, 9, 1)),
     ],
 )
 def test_parse(s: str, p: Permutation) -> None:
@@ -163,6 +167,9 @@ def test_bad_from_cycles(cycles: list[tuple[int, ...]]) -> None:
         "(1 2 3,)",
         "(1,,2)",
         "(1, ,2)",
+        "(1__0)",
+        "(1_)",
+        "(++1)",
     ],
 )
 def test_bad_parse(s: str) -> None:
@@ -170,6 +177,14 @@ def test_bad_parse(s: str) -> None:
         Permutation.parse(s)
 
 
+@pytest.mark.parametrize("tail", ["1", "x)"])
+def test_bad_parse_long_whitespace(tail: str) -> None:
+    # A long run of whitespace that isn't followed by a valid cycle must be
+    # rejected without the regex backtracking over every split of the run.
+    with pytest.raises(ValueError):
+        Permutation.parse("(" + " " * 100000 + tail)
+
+
 @pytest.mark.parametrize(
     "img",
     [
@@ -187,3 +202,65 @@ def test_bad_parse(s: str) -> None:
 def test_bad_init(img: list[int]) -> None:
     with pytest.raises(ValueError):
         Permutation(*img)
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(protocol: int) -> None:
+    p = Permutation(3, 1, 2, 5, 4)
+    assert p.order == 6
+    q = pickle.loads(pickle.dumps(p, protocol))
+    assert q == p
+    assert q.to_cycles() == [(1, 3, 2), (4, 5)]
+    assert q.order == 6
+    assert copy.copy(p) == p
+    assert copy.deepcopy(p) == p
+
+
+class ReversedPermutation(Permutation):
+    """A subclass whose constructor takes the image in reverse order"""
+
+    def __init__(self, *img: int) -> None:
+        super().__init__(*reversed(img))
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle_subclass(protocol: int) -> None:
+    p = ReversedPermutation(4, 5, 1, 2, 3)
+    assert p.to_image() == (3, 2, 1, 5, 4)
+    q = pickle.loads(pickle.dumps(p, protocol))
+    assert type(q) is ReversedPermutation
+    assert q == p
+    assert q.to_image() == (3, 2, 1, 5, 4)
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle_subclass_attributes(protocol: int) -> None:
+    p = ReversedPermutation(4, 5, 1, 2, 3)
+    p.label = "foo"  # type: ignore[attr-defined]
+    q = pickle.loads(pickle.dumps(p, protocol))
+    assert type(q) is ReversedPermutation
+    assert q.to_image() == (3, 2, 1, 5, 4)
+    assert q.label == "foo"  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        # `pickle.dumps(Permutation(2, 3, 1), 0)` under v0.5.0
+        b"ccopy_reg\n_reconstructor\np0\n(cpermutation\nPermutation\np1\n"
+        b"c__builtin__\nobject\np2\nNtp3\nRp4\n(dp5\nV_Permutation__map\np6\n"
+        b"(I2\nI3\nI1\ntp7\nsb.",
+        # `pickle.dumps(Permutation(2, 3, 1), 2)` under v0.5.0
+        b"\x80\x02cpermutation\nPermutation\nq\x00)\x81q\x01}q\x02X\x11\x00\x00"
+        b"\x00_Permutation__mapq\x03K\x02K\x03K\x01\x87q\x04sb.",
+    ],
+)
+def test_unpickle_legacy(data: bytes) -> None:
+    p = pickle.loads(data)
+    assert type(p) is Permutation
+    assert p == Permutation(2, 3, 1)
+    assert p.to_image() == (2, 3, 1)
+    assert p.to_cycles() == [(1, 2, 3)]
+    assert p.order == 3
+    assert p.is_even
+    assert hash(p) == hash(Permutation(2, 3, 1))
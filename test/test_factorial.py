@@ -1,4 +1,5 @@
 from __future__ import annotations
+from math import factorial
 import pytest
 from permutation import from_factorial_base, to_factorial_base
 
@@ -78,3 +79,10 @@ def test_from_factorial_base(n: int, digits: list[int]) -> None:
 def test_bad_from_factorial_base(digits: tuple[int, ...]) -> None:
     with pytest.raises(ValueError):
         from_factorial_base(digits)
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 10, 25])
+def test_factorial_boundaries(k: int) -> None:
+    assert to_factorial_base(factorial(k)) == [1] + [0] * (k - 1)
+    assert to_factorial_base(factorial(k) - 1) == (list(range(k - 1, 0, -1)) or [0])
+    assert from_factorial_base([1] + [0] * (k - 1)) == factorial(k)
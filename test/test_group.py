@@ -1,4 +1,3 @@
-from itertools import zip_longest
 import pytest
 from permutation import Permutation
 
@@ -31,7 +30,9 @@ S4 = [
 
 
 def test_s4() -> None:
-    for i, (p, q) in enumerate(zip_longest(Permutation.group(4), S4)):
+    s4 = list(Permutation.group(4))
+    assert len(s4) == len(S4)
+    for i, (p, q) in enumerate(zip(s4, S4)):
         assert p == q
         assert p.left_lehmer() == i
 
@@ -61,3 +62,18 @@ def test_s0() -> None:
 def test_bad_group() -> None:
     with pytest.raises(ValueError):
         Permutation.group(-1)
+
+
+def test_s5() -> None:
+    s5 = list(Permutation.group(5))
+    assert len(s5) == 120
+    for i, p in enumerate(s5):
+        assert p.degree <= 5
+        assert p.left_lehmer() == i
+
+
+def test_next_prev_permutation_s5() -> None:
+    for p in Permutation.group(5):
+        q = p.next_permutation()
+        assert q.left_lehmer() == p.left_lehmer() + 1
+        assert q.prev_permutation() == p
@@ -47,4 +47,14 @@ def test_inverse(p: Permutation, q: Permutation) -> None:
     assert p * q == q * p == Permutation()
 
 
+def test_inverse_cached_properties() -> None:
+    p = Permutation.from_cycles((1, 2, 3), (4, 5))
+    assert p.order == 6
+    assert p.is_odd
+    q = p.inverse()
+    assert q.order == 6
+    assert q.is_odd
+    assert q == Permutation.from_cycles((1, 3, 2), (4, 5))
+
+
 # vim:set nowrap:
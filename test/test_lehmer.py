@@ -1,6 +1,7 @@
 from __future__ import annotations
+from itertools import permutations
 import pytest
-from permutation import Permutation
+from permutation import Permutation, from_factorial_base
 
 PERMUTATIONS = [
     (Permutation(1, 2, 3), 0, 0, []),
@@ -74,3 +75,36 @@ def test_from_lehmer(p: int, degree: int, lehmer: int) -> None:
 def test_bad_from_lehmer(lehmer: int, degree: int) -> None:
     with pytest.raises(ValueError):
         Permutation.from_lehmer(lehmer, degree)
+
+
+def test_right_inversion_count_large() -> None:
+    img = [7 * i % 101 + 1 for i in range(101)]
+    p = Permutation(*img)
+    assert p.right_inversion_count() == [
+        sum(1 for y in img[i + 1 :] if y < x) for i, x in enumerate(img)
+    ]
+
+
+def test_left_lehmer_large() -> None:
+    img = [7 * i % 101 + 1 for i in range(101)]
+    digits = [sum(1 for y in img[: x - 1] if y > img[x - 1]) for x in range(101, 0, -1)]
+    assert Permutation(*img).left_lehmer() == from_factorial_base(digits[:-1])
+
+
+def test_lehmer_roundtrip_large() -> None:
+    p = Permutation(*(7 * i % 101 + 1 for i in range(101)))
+    assert Permutation.from_lehmer(p.lehmer(101), 101) == p
+    assert Permutation.from_left_lehmer(p.left_lehmer()) == p
+
+
+@pytest.mark.parametrize("n", range(6))
+def test_lehmer_all_of_degree(n: int) -> None:
+    # `itertools.permutations()` yields words in lexicographic order, i.e.,
+    # in order of their Lehmer codes.
+    for i, img in enumerate(permutations(range(1, n + 1))):
+        p = Permutation(*img)
+        assert p.right_inversion_count(n) == [
+            sum(1 for y in img[j + 1 :] if y < x) for j, x in enumerate(img)
+        ]
+        assert p.lehmer(n) == i
+        assert Permutation.from_lehmer(i, n) == p
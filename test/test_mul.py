@@ -662,4 +662,15 @@ def test_mul(i: int, j: int) -> None:
     assert S4[i] * S4[j] == S4[CAYLEY[i][j]]
 
 
+@pytest.mark.parametrize("i", range(24))
+@pytest.mark.parametrize("j", range(24))
+def test_mul_parity(i: int, j: int) -> None:
+    p = S4[i]
+    q = S4[j]
+    # Compute the factors' parities first so that they're cached:
+    parity = p.is_even == q.is_even
+    assert (p * q).is_even is parity
+    assert (p * q).is_even is S4[CAYLEY[i][j]].is_even
+
+
 # vim:set nowrap:
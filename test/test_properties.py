@@ -267,6 +267,20 @@ def test_is_even(p: Permutation, even: bool) -> None:
     assert p.is_even is even
 
 
+@pytest.mark.parametrize("p,even", [(pd.p, pd.even) for pd in PERMUTATIONS])
+def test_is_even_after_to_cycles(p: Permutation, even: bool) -> None:
+    q = Permutation(*p.to_image())
+    q.to_cycles()
+    assert q.is_even is even
+
+
+@pytest.mark.parametrize("p,even", [(pd.p, pd.even) for pd in PERMUTATIONS])
+def test_is_even_after_order(p: Permutation, even: bool) -> None:
+    q = Permutation(*p.to_image())
+    assert q.order == p.order
+    assert q.is_even is even
+
+
 @pytest.mark.parametrize("p,even", [(pd.p, pd.even) for pd in PERMUTATIONS])
 def test_is_odd(p: Permutation, even: bool) -> None:
     assert p.is_odd is (not even)
@@ -359,4 +373,12 @@ def test_inversions(p: Permutation, inversions: int) -> None:
     assert p.inversions() == inversions
 
 
+def test_to_cycles_is_copy() -> None:
+    p = Permutation(2, 1, 4, 5, 3)
+    cycles = p.to_cycles()
+    cycles.append((6, 7))
+    assert p.to_cycles() == [(1, 2), (3, 4, 5)]
+    assert p.order == 6
+
+
 # vim:set nowrap: